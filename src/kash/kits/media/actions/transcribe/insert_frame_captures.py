@@ -1,7 +1,6 @@
 from pathlib import Path
 
 from chopdiff.divs import parse_divs
-from flexdoc.docs.search_tokens import search_tokens
 from flexdoc.html import TimestampExtractor, html_img, md_para
 from sidematter_format import Sidematter
 from strif import Insertion, insert_multiple
@@ -34,6 +33,20 @@ def has_frame_captures(item: Item) -> bool:
 SIM_THRESHOLD = 0.5
 
 
+def _next_close_indices(wordtoks: list[str], close_tok: str = "</span>") -> list[int]:
+    """
+    For each token index, the index of the first `close_tok` strictly after it, or -1.
+    Computed in one reverse pass so each lookup is constant time.
+    """
+    next_close = [-1] * len(wordtoks)
+    last = -1
+    for i in range(len(wordtoks) - 1, -1, -1):
+        next_close[i] = last
+        if wordtoks[i] == close_tok:
+            last = i
+    return next_close
+
+
 def _prune_filtered_frames(abs_frame_paths: list[Path], kept_indices: set[int]) -> None:
     for index, frame_path in enumerate(abs_frame_paths):
         if index not in kept_indices:
@@ -111,22 +124,18 @@ def insert_frame_captures(item: Item, threshold: float = SIM_THRESHOLD) -> Item:
         len(extractor.offsets),
     )
     insertions: list[Insertion] = []
+    next_close = _next_close_indices(extractor.wordtoks)
     for i, (timestamp, index, offset) in enumerate(timestamp_matches):
         # Only process timestamps whose frames weren't filtered out
         if i not in kept_indices:
             continue
 
-        try:
-            insert_index = (
-                search_tokens(extractor.wordtoks)
-                .at(index)
-                .seek_forward(["</span>"])
-                .next()
-                .get_index()
-            )
-        except KeyError:
+        # Insert just after the tag close following the timestamp.
+        close_index = next_close[index]
+        insert_index = close_index + 1
+        if close_index == -1 or insert_index >= len(extractor.wordtoks):
             raise ContentError(
-                f"No matching tag close starting at {offset}: {extractor.wordtoks[offset:]}"
+                f"No matching tag close starting at {offset}: {extractor.wordtoks[index:]}"
             )
 
         new_offset = extractor.offsets[insert_index]
@@ -167,3 +176,9 @@ def test_prune_filtered_frames_removes_only_rejected_candidates() -> None:
         _prune_filtered_frames(frame_paths, {0, 2})
 
         assert [frame_path.exists() for frame_path in frame_paths] == [True, False, True, False]
+
+
+def test_next_close_indices() -> None:
+    wordtoks = ["<span>", "a", "</span>", "b", "<span>", "c", "</span>", "d"]
+    assert _next_close_indices(wordtoks) == [2, 2, 6, 6, 6, 6, -1, -1]
+    assert _next_close_indices([]) == []
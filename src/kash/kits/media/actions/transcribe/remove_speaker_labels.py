@@ -1,15 +1,31 @@
-from flexdoc.html import html_find_tag
-from strif import replace_multiple
+import re
 
 from kash.config.logger import get_logger
 from kash.exec import kash_action
 from kash.exec.preconditions import has_html_body, has_simple_text_body
+from kash.media_base.timestamp_citations import DATA_SPEAKER_ID
 from kash.model import Item, ItemType
 from kash.utils.errors import InvalidInput
 
 log = get_logger(__name__)
 
 
+_SPEAKER_SPAN_RE = re.compile(
+    rf"<span\b[^>]*\b{re.escape(DATA_SPEAKER_ID)}\b[^>]*>.*?</span>", re.DOTALL | re.IGNORECASE
+)
+"""
+Matches a whole `<span data-speaker-id=...>...</span>` element. Speaker label spans only
+wrap the label text, never other spans, so a non-greedy match is sufficient.
+"""
+
+
+def strip_speaker_spans(html_string: str) -> str:
+    """
+    Remove all speaker label spans from the string in a single pass.
+    """
+    return _SPEAKER_SPAN_RE.sub("", html_string)
+
+
 @kash_action(
     precondition=has_html_body | has_simple_text_body,
 )
@@ -21,18 +37,25 @@ def remove_speaker_labels(item: Item) -> Item:
     if not item.body:
         raise InvalidInput("Item must have a body")
 
-    # Find all <span data-speaker-id=...>...</span> elements.
-    matches = html_find_tag(item.body, tag_name="span", attr_name="data-speaker-id")
-
-    # Prepare replacements to remove these elements.
-    replacements = []
-    for match in matches:
-        replacements.append((match.start_offset, match.end_offset, ""))
-
     # Remove the speaker labels from the body.
-    new_body = replace_multiple(item.body, replacements)
+    new_body = strip_speaker_spans(item.body)
 
     # Create a new item with the cleaned body with same doc type and format.
     output_item = item.derived_copy(type=ItemType.doc, body=new_body)
 
     return output_item
+
+
+## Tests
+
+
+def test_strip_speaker_spans():
+    html_string = (
+        '<span class="speaker-label" data-speaker-id="0">SPEAKER 0:</span> Hello. '
+        '<span data-timestamp="1.5">Hi</span> there. '
+        '<span class="speaker-label" data-speaker-id="1">**Bob:**</span> Hi.'
+    )
+    assert strip_speaker_spans(html_string) == (
+        ' Hello. <span data-timestamp="1.5">Hi</span> there.  Hi.'
+    )
+    assert strip_speaker_spans("No labels here.") == "No labels here."
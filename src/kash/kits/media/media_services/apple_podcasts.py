@@ -1,4 +1,6 @@
+import re
 from datetime import date
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, override
 from urllib.parse import parse_qs, urlparse
@@ -27,40 +29,53 @@ log = get_logger(__name__)
 # https://podcasters.apple.com/support/847-hosts-and-guests
 
 
+APPLE_PODCASTS_HOSTS = frozenset({"podcasts.apple.com", "itunes.apple.com"})
+
+PODCAST_ID_PATTERN = re.compile(r"/(id\d+)(?:/|$)")
+
+
+@lru_cache(maxsize=1024)
+def _parse_apple_url(url: str) -> tuple[str, str | None] | None:
+    """
+    Parse an Apple Podcasts URL into its podcast id (like `id1303792223`) and episode id
+    (the `i` query parameter, if any). Memoized since the same URLs are canonicalized and
+    have ids extracted repeatedly.
+    """
+    parsed_url = urlparse(url)
+    if parsed_url.hostname not in APPLE_PODCASTS_HOSTS:
+        return None
+    id_match = PODCAST_ID_PATTERN.search(parsed_url.path)
+    if not id_match:
+        return None
+    episode_id = parse_qs(parsed_url.query).get("i", [None])[0]
+    return id_match.group(1), episode_id
+
+
 class ApplePodcasts(MediaService):
     @override
     def canonicalize_and_type(self, url: Url) -> tuple[Url | None, MediaUrlType | None]:
-        parsed_url = urlparse(url)
-        if parsed_url.hostname in ("podcasts.apple.com", "itunes.apple.com"):
-            path_parts = parsed_url.path.split("/")
-            for part in path_parts:
-                if part.startswith("id"):
-                    podcast_id = part
-                    query = parse_qs(parsed_url.query)
-                    episode_id = query.get("i", [None])[0]
-                    if episode_id:
-                        return (
-                            Url(f"https://podcasts.apple.com/podcast/{podcast_id}?i={episode_id}"),
-                            MediaUrlType.episode,
-                        )
-                    return (
-                        Url(f"https://podcasts.apple.com/podcast/{podcast_id}"),
-                        MediaUrlType.podcast,
-                    )
-        return None, None
+        ids = _parse_apple_url(url)
+        if not ids:
+            return None, None
+        podcast_id, episode_id = ids
+        if episode_id:
+            return (
+                Url(f"https://podcasts.apple.com/podcast/{podcast_id}?i={episode_id}"),
+                MediaUrlType.episode,
+            )
+        return (
+            Url(f"https://podcasts.apple.com/podcast/{podcast_id}"),
+            MediaUrlType.podcast,
+        )
 
     @override
     def get_media_id(self, url: Url) -> str | None:
-        parsed_url = urlparse(url)
-        if parsed_url.hostname in ("podcasts.apple.com", "itunes.apple.com"):
-            path_parts = parsed_url.path.split("/")
-            for part in path_parts:
-                if part.startswith("id"):
-                    podcast_id = part
-                    query = parse_qs(parsed_url.query)
-                    episode_id = query.get("i", [None])[0]
-                    if episode_id:
-                        return f"{podcast_id}?i={episode_id}"
+        ids = _parse_apple_url(url)
+        if not ids:
+            return None
+        podcast_id, episode_id = ids
+        if episode_id:
+            return f"{podcast_id}?i={episode_id}"
         return None
 
     @override
@@ -175,6 +190,7 @@ def test_canonicalize_apple():
     assert apple.get_media_id(Url("https://podcasts.apple.com/us/podcast/id1627920305")) is None
     assert apple.get_media_id(Url("https://podcasts.apple.com/podcast/id1234567890")) is None
     assert apple.get_media_id(Url("https://example.com/podcast/123")) is None
+    assert apple.canonicalize(Url("https://podcasts.apple.com/us/podcast/idaho-hikes")) is None
 
     assert (
         apple.get_media_id(Url("https://podcasts.apple.com/podcast/id1234567890?i=1000635337486"))
@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, override
 from urllib.parse import parse_qs, urlparse
@@ -27,74 +28,88 @@ log = get_logger(__name__)
 VIDEO_ID_PATTERN = re.compile(r"^[a-zA-Z0-9_-]{11}$")
 
 
-class YouTube(MediaService):
-    @override
-    def canonicalize_and_type(self, url: Url) -> tuple[Url | None, MediaUrlType | None]:
-        parsed_url = urlparse(url)
-        path_parts = parsed_url.path.strip("/").split("/")
-
-        if parsed_url.hostname == "youtu.be":
-            video_id = self.get_media_id(url)
-            if video_id:
-                return Url(f"https://www.youtube.com/watch?v={video_id}"), MediaUrlType.video
-        elif parsed_url.hostname in ("www.youtube.com", "youtube.com", "m.youtube.com"):
-            # Check for channel URLs first, as they have distinct paths
-            if (
-                len(path_parts) > 0
-                and path_parts[0] in ("channel", "c", "user")
-                or parsed_url.path.startswith("/@")
-            ):
-                # It's already a canonical channel URL or a recognized format.
-                # TODO: Consider canonicalizing /c/ and /user/ to /@handle if possible?
-                return url, MediaUrlType.channel
-
-            query = parse_qs(parsed_url.query)
-
-            # Check for playlist URLs
-            if len(path_parts) > 0 and path_parts[0] == "playlist":
-                list_id = query.get("list", [""])[0]
-                if list_id:
-                    return (
-                        Url(f"https://www.youtube.com/playlist?list={list_id}"),
-                        MediaUrlType.playlist,
-                    )
-
-            # Check for /live/ and /shorts/ paths
-            if len(path_parts) == 2 and path_parts[0] in ("live", "shorts"):
-                video_id = path_parts[1]
-                if VIDEO_ID_PATTERN.match(video_id):
-                    return Url(f"https://www.youtube.com/watch?v={video_id}"), MediaUrlType.video
-
-            # Fallback to checking ?v= query parameter for standard video URLs
-            video_id = query.get("v", [""])[0]
-            if video_id and VIDEO_ID_PATTERN.match(video_id):
+@lru_cache(maxsize=4096)
+def _youtube_canonicalize_and_type(url: Url) -> tuple[Url | None, MediaUrlType | None]:
+    """
+    Canonicalize a YouTube URL. Memoized since preconditions like `is_youtube_video` run
+    this on the same URLs over and over (e.g. once per upstream item in a provenance search).
+    """
+    parsed_url = urlparse(url)
+    path_parts = parsed_url.path.strip("/").split("/")
+
+    if parsed_url.hostname == "youtu.be":
+        video_id = _youtube_media_id(url)
+        if video_id:
+            return Url(f"https://www.youtube.com/watch?v={video_id}"), MediaUrlType.video
+    elif parsed_url.hostname in ("www.youtube.com", "youtube.com", "m.youtube.com"):
+        # Check for channel URLs first, as they have distinct paths
+        if (
+            len(path_parts) > 0
+            and path_parts[0] in ("channel", "c", "user")
+            or parsed_url.path.startswith("/@")
+        ):
+            # It's already a canonical channel URL or a recognized format.
+            # TODO: Consider canonicalizing /c/ and /user/ to /@handle if possible?
+            return url, MediaUrlType.channel
+
+        query = parse_qs(parsed_url.query)
+
+        # Check for playlist URLs
+        if len(path_parts) > 0 and path_parts[0] == "playlist":
+            list_id = query.get("list", [""])[0]
+            if list_id:
+                return (
+                    Url(f"https://www.youtube.com/playlist?list={list_id}"),
+                    MediaUrlType.playlist,
+                )
+
+        # Check for /live/ and /shorts/ paths
+        if len(path_parts) == 2 and path_parts[0] in ("live", "shorts"):
+            video_id = path_parts[1]
+            if VIDEO_ID_PATTERN.match(video_id):
                 return Url(f"https://www.youtube.com/watch?v={video_id}"), MediaUrlType.video
 
-        # If none of the above matched
-        return None, None
+        # Fallback to checking ?v= query parameter for standard video URLs
+        video_id = query.get("v", [""])[0]
+        if video_id and VIDEO_ID_PATTERN.match(video_id):
+            return Url(f"https://www.youtube.com/watch?v={video_id}"), MediaUrlType.video
+
+    # If none of the above matched
+    return None, None
 
-    @override
-    def get_media_id(self, url: Url) -> str | None:
-        parsed_url = urlparse(url)
-        path_parts = parsed_url.path.strip("/").split("/")
 
-        if parsed_url.hostname == "youtu.be":
-            video_id = parsed_url.path[1:]
+@lru_cache(maxsize=4096)
+def _youtube_media_id(url: Url) -> str | None:
+    parsed_url = urlparse(url)
+    path_parts = parsed_url.path.strip("/").split("/")
+
+    if parsed_url.hostname == "youtu.be":
+        video_id = parsed_url.path[1:]
+        if VIDEO_ID_PATTERN.match(video_id):
+            return video_id
+    elif parsed_url.hostname in ("www.youtube.com", "youtube.com", "m.youtube.com"):
+        # Check paths first
+        if len(path_parts) == 2 and path_parts[0] in ("live", "shorts"):
+            video_id = path_parts[1]
             if VIDEO_ID_PATTERN.match(video_id):
                 return video_id
-        elif parsed_url.hostname in ("www.youtube.com", "youtube.com", "m.youtube.com"):
-            # Check paths first
-            if len(path_parts) == 2 and path_parts[0] in ("live", "shorts"):
-                video_id = path_parts[1]
-                if VIDEO_ID_PATTERN.match(video_id):
-                    return video_id
-
-            # Check query parameter
-            query = parse_qs(parsed_url.query)
-            video_id = query.get("v", [""])[0]
-            if video_id and VIDEO_ID_PATTERN.match(video_id):
-                return video_id
-        return None
+
+        # Check query parameter
+        query = parse_qs(parsed_url.query)
+        video_id = query.get("v", [""])[0]
+        if video_id and VIDEO_ID_PATTERN.match(video_id):
+            return video_id
+    return None
+
+
+class YouTube(MediaService):
+    @override
+    def canonicalize_and_type(self, url: Url) -> tuple[Url | None, MediaUrlType | None]:
+        return _youtube_canonicalize_and_type(url)
+
+    @override
+    def get_media_id(self, url: Url) -> str | None:
+        return _youtube_media_id(url)
 
     @override
     def thumbnail_url(self, url: Url) -> Url | None:
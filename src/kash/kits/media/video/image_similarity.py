@@ -1,23 +1,29 @@
 from __future__ import annotations
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
 
-import cv2
-from numpy.typing import NDArray
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
 
 
-def frames_are_similar(frame1: NDArray[Any], frame2: NDArray[Any], threshold: float = 0.95) -> bool:
+FRAME_BATCH_SIZE = 32
+"""Frames decoded and compared together, bounding how many are held in memory."""
+
+MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def gray_frames_are_similar(
+    gray1: NDArray[Any], gray2: NDArray[Any], threshold: float = 0.95
+) -> bool:
     """
-    Compare two frames to determine if they are similar based on structural similarity.
+    Compare two grayscale frames by structural similarity.
     Returns True if frames are similar above the threshold.
     """
     from skimage.metrics import structural_similarity
 
-    # Convert frames to grayscale and compute structural similarity.
-    gray1 = cv2.cvtColor(frame1, cv2.COLOR_BGR2GRAY)
-    gray2 = cv2.cvtColor(frame2, cv2.COLOR_BGR2GRAY)
-
     # The structural_similarity function returns different values depending on 'full' parameter
     # When full=True, it returns (score, diff_image)
     # skimage's stubs return an undiscriminated union for full/gradient variants;
@@ -27,7 +33,23 @@ def frames_are_similar(frame1: NDArray[Any], frame2: NDArray[Any], threshold: fl
     return float(score) > threshold
 
 
-def filter_similar_frames(frame_paths: list[Path], threshold: float = 0.95) -> list[int]:
+def frames_are_similar(frame1: NDArray[Any], frame2: NDArray[Any], threshold: float = 0.95) -> bool:
+    """
+    Compare two frames to determine if they are similar based on structural similarity.
+    Returns True if frames are similar above the threshold.
+    """
+    import cv2
+
+    # Convert frames to grayscale and compute structural similarity.
+    gray1 = cv2.cvtColor(frame1, cv2.COLOR_BGR2GRAY)
+    gray2 = cv2.cvtColor(frame2, cv2.COLOR_BGR2GRAY)
+
+    return gray_frames_are_similar(gray1, gray2, threshold)
+
+
+def filter_similar_frames(
+    frame_paths: list[Path], threshold: float = 0.95, max_workers: int = MAX_WORKERS
+) -> list[int]:
     """
     Take a list of frame paths and return indices of unique frames,
     where each is sufficiently different from its predecessor.
@@ -40,16 +62,36 @@ def filter_similar_frames(frame_paths: list[Path], threshold: float = 0.95) -> l
     if missing_paths:
         raise FileNotFoundError(f"Frame paths not found: {missing_paths}")
 
+    import cv2
+
+    def read_gray(path: Path) -> NDArray[Any]:
+        # Decode straight to grayscale, since that's all the comparison uses.
+        gray = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            raise RuntimeError(f"Failed to read frame: {path}")
+        return gray
+
+    def is_similar(pair: tuple[NDArray[Any], NDArray[Any]]) -> bool:
+        return gray_frames_are_similar(pair[0], pair[1], threshold)
+
     unique_indices = [0]  # Always keep first frame
 
-    for i in range(1, len(frame_paths)):
-        curr_frame = cv2.imread(str(frame_paths[i]))
-        prev_frame = cv2.imread(str(frame_paths[i - 1]))
+    # Each frame is only compared to its predecessor, so both decoding and comparisons
+    # can run on a thread pool (OpenCV and NumPy release the GIL). Work in batches so
+    # only a bounded number of decoded frames are in memory at once. Each frame is
+    # decoded once and the last of each batch is carried over as the next predecessor.
+    prev_gray: NDArray[Any] | None = None
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for start in range(0, len(frame_paths), FRAME_BATCH_SIZE):
+            batch = list(executor.map(read_gray, frame_paths[start : start + FRAME_BATCH_SIZE]))
+            grays = batch if prev_gray is None else [prev_gray, *batch]
+            first_index = start + 1 if prev_gray is None else start
 
-        if curr_frame is None or prev_frame is None:
-            raise RuntimeError(f"Failed to read frames: {frame_paths[i - 1]} or {frame_paths[i]}")
+            similar = executor.map(is_similar, zip(grays[1:], grays[:-1], strict=True))
+            for i, frame_is_similar in enumerate(similar, start=first_index):
+                if not frame_is_similar:
+                    unique_indices.append(i)
 
-        if not frames_are_similar(curr_frame, prev_frame, threshold):
-            unique_indices.append(i)
+            prev_gray = batch[-1]
 
     return unique_indices
@@ -1,6 +1,5 @@
 from pathlib import Path
 
-import cv2
 from kash.config.logger import get_logger
 from kash.utils.common.format_utils import fmt_loc
 from kash.utils.errors import ContentError, FileNotFound
@@ -9,6 +8,13 @@ from strif import StringTemplate, atomic_output_file
 log = get_logger(__name__)
 
 
+SEQUENTIAL_READ_SECS = 5.0
+"""
+Gaps between requested frames up to this long are decoded through rather than seeked,
+since a seek decodes forward from the previous keyframe anyway.
+"""
+
+
 def capture_frames(
     video_file: Path,
     timestamps: list[float],
@@ -22,14 +28,14 @@ def capture_frames(
     provided pattern. Returns a list of paths to the captured frames, which
     will be relative to the target directory.
     """
+    import cv2
+
     if not Path(video_file).is_file():
         raise FileNotFound(f"Video file not found: {video_file}")
 
     target_template = StringTemplate(
         target_pattern, allowed_fields=[("prefix", str), ("frame_number", int)]
     )
-    captured_frames = []
-
     log.message(f"Capturing frames from video: {fmt_loc(video_file)}")
 
     video = cv2.VideoCapture(str(video_file))
@@ -49,30 +55,46 @@ def capture_frames(
         )
 
         log.message("Saving captured frames from: %s", fmt_loc(video_file))
-        for i, timestamp in enumerate(timestamps):
-            frame_number = int(fps * timestamp)
+
+        # Visit frames in video order so nearby frames can be reached by decoding forward
+        # instead of seeking, which restarts decoding from the previous keyframe every time.
+        frame_numbers = [int(fps * timestamp) for timestamp in timestamps]
+        max_grab_gap = int(fps * SEQUENTIAL_READ_SECS)
+        next_frame = 0
+        frame = None
+        captured_by_index: dict[int, Path] = {}
+        for i in sorted(range(len(timestamps)), key=frame_numbers.__getitem__):
+            timestamp = timestamps[i]
+            frame_number = frame_numbers[i]
             if frame_number >= total_frames:
                 log.warning(f"Timestamp {timestamp}s is beyond video duration {duration:.2f}s")
                 continue
 
-            video.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-
-            success, frame = video.read()
-            if success:
-                rel_path = target_template.format(prefix=prefix, frame_number=i)
-                target_path = target_dir / rel_path
-                with atomic_output_file(
-                    target_path, make_parents=True, tmp_suffix=target_path.suffix
-                ) as tmp_path:
-                    cv2.imwrite(str(tmp_path.resolve()), frame)
-                captured_frames.append(rel_path)
-                log.message("Saved frame: %s", fmt_loc(locator=target_path))
-
-            else:
-                log.error(f"Failed to read frame {frame_number} at timestamp {timestamp}s")
-                raise ContentError(
-                    f"Failed to capture frame {frame_number} at timestamp {timestamp} from {fmt_loc(video_file)}"
-                )
+            if frame is None or frame_number != next_frame - 1:
+                gap = frame_number - next_frame
+                if 0 <= gap <= max_grab_gap:
+                    for _ in range(gap):
+                        video.grab()
+                else:
+                    video.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+                success, frame = video.read()
+                next_frame = frame_number + 1
+                if not success:
+                    log.error(f"Failed to read frame {frame_number} at timestamp {timestamp}s")
+                    raise ContentError(
+                        f"Failed to capture frame {frame_number} at timestamp {timestamp} from {fmt_loc(video_file)}"
+                    )
+
+            rel_path = Path(target_template.format(prefix=prefix, frame_number=i))
+            target_path = target_dir / rel_path
+            with atomic_output_file(
+                target_path, make_parents=True, tmp_suffix=target_path.suffix
+            ) as tmp_path:
+                cv2.imwrite(str(tmp_path.resolve()), frame)
+            captured_by_index[i] = rel_path
+            log.message("Saved frame: %s", fmt_loc(locator=target_path))
+
+        captured_frames = [captured_by_index[i] for i in sorted(captured_by_index)]
     finally:
         video.release()
 
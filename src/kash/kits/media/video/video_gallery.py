@@ -4,7 +4,6 @@ from pathlib import Path
 from frontmatter_format import to_yaml_string
 from kash.config.logger import get_logger
 from kash.llm_utils.clean_headings import clean_heading, summary_heading
-from kash.media_base.media_services import get_media_id
 from kash.model.items_model import Item, ItemType
 from kash.utils.common.type_utils import as_dataclass
 from kash.utils.errors import InvalidInput
@@ -12,6 +11,7 @@ from kash.utils.file_utils.file_formats_model import Format
 from kash.web_gen.template_render import additional_template_dirs, render_web_template
 from kash.workspaces.source_items import find_upstream_item
 
+from kash.kits.media.media_services import youtube
 from kash.kits.media.video.video_preconditions import is_youtube_video
 
 log = get_logger(__name__)
@@ -40,13 +40,14 @@ def video_gallery_config(items: list[Item]) -> Item:
     """
     videos = []
     for item in items:
+        # The source item is known to be a YouTube URL, so only the id needs checking.
         source_item = find_upstream_item(item, is_youtube_video)
 
-        youtube_id = get_media_id(source_item.url)
+        youtube_id = source_item.url and youtube.get_media_id(source_item.url)
         log.message(
             "Pulling video from source item: %s: %s", source_item.store_path, source_item.url
         )
-        if not youtube_id or not is_youtube_video(source_item):
+        if not youtube_id:
             raise InvalidInput(f"Item must be a YouTube URL with id: {source_item}")
 
         video_info = VideoInfo(
@@ -77,9 +78,10 @@ def video_gallery_generate(config_item: Item) -> str:
     video_gallery = as_dataclass(config, VideoGallery)  # Checks the format.
 
     with additional_template_dirs(templates_dir):
+        # Jinja reads dataclass attributes directly, so no need to deep-copy via asdict().
         content = render_web_template(
             "youtube_gallery.html.jinja",
-            asdict(video_gallery),
+            {"title": video_gallery.title, "videos": video_gallery.videos},
         )
 
         return render_web_template(
@@ -1,16 +1,15 @@
 from kash.exec.precondition_registry import kash_precondition
+from kash.media_base.media_services import get_media_id
 from kash.model.items_model import Item
 
+from kash.kits.media.media_services import youtube
+
 
 @kash_precondition
 def has_video_id(item: Item) -> bool:
-    from kash.media_base.media_services import get_media_id
-
     return bool(item.url and get_media_id(item.url))
 
 
 @kash_precondition
 def is_youtube_video(item: Item) -> bool:
-    from kash.kits.media.media_services import youtube
-
     return bool(item.url and youtube.canonicalize(item.url))